@@ -8,13 +8,19 @@
 
 """Base API client for the GEO Knowledge Hub services."""
 
+import logging
+
 from pydash import py_
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List
 
+from .cache import HashCache, file_identity
 from .network import HTTPXClient
 
+logger = logging.getLogger(__name__)
+
 
 def _validate_type(type_):
     """Check if type is valid."""
@@ -28,11 +34,83 @@ def _validate_url(url):
         raise RuntimeError("Metadata don't have the correct link for this operation.")
 
 
+def _package_metadata(package):
+    """Get the service metadata of a package.
+
+    Note:
+        Element definitions (with the service metadata in the `metadata` key)
+        are still accepted for backward compatibility.
+    """
+    return package if "links" in package else package["metadata"]
+
+
+def _resource_id(resource):
+    """Get the id of a resource.
+
+    Note:
+        Element definitions (with the service metadata in the `metadata` key)
+        are still accepted for backward compatibility.
+    """
+    if "metadata" in resource and "id" not in resource:
+        resource = resource["metadata"]
+
+    return resource["id"]
+
+
+def _validate_checksum(checksum, digests):
+    """Check if a checksum (e.g. `md5:<hex>`) matches the digests computed locally.
+
+    Returns:
+        Optional[bool]: ``None`` when the checksum can't be verified (the checksum is
+                        not available or its algorithm is not supported).
+    """
+    if not checksum:
+        return None
+
+    algorithm, _, value = checksum.partition(":")
+
+    if algorithm not in digests:
+        return None
+
+    return digests[algorithm] == value
+
+
 class GEOKnowledgeHubApi:
-    def __init__(self, package_api: str, record_api: str):
+    upload_max_attempts = 3
+    """Maximum number of uploads of a file with an invalid checksum."""
+
+    concurrent_file_size = 8 * 1024 * 1024
+    """Files up to this size (in bytes) are queued and uploaded concurrently."""
+
+    max_workers = 8
+    """Maximum number of concurrent requests (uploads and DOI reservations)."""
+
+    def __init__(self, package_api: str, record_api: str, hash_cache: HashCache = None):
+        """Initializer.
+
+        Args:
+            package_api (str): Address to the Package API.
+
+            record_api (str): Address to the Record API.
+
+            hash_cache (HashCache): Cache of the file digests. When not defined, an
+                                    in-memory cache is created and owned by this
+                                    object (it is closed by ``close``).
+
+        Note:
+            The object owns a pool of threads, shared by all the uploads and DOI
+            reservations. Use ``close`` to release it.
+        """
         self._package_api = package_api
         self._record_api = record_api
 
+        self._owns_hash_cache = hash_cache is None
+        self._hash_cache = HashCache() if self._owns_hash_cache else hash_cache
+
+        # uploads of small files queued (of all elements)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._queued_uploads = []
+
     #
     # Properties
     #
@@ -44,6 +122,28 @@ class GEOKnowledgeHubApi:
     def record_api(self):
         return self._record_api
 
+    @property
+    def hash_cache(self):
+        """Cache with the digests (``md5`` and ``sha256``) of the files uploaded and verified.
+
+        Note:
+            Files whose checksum was not returned by the service are not verified
+            and, for this reason, are not included.
+        """
+        return self._hash_cache
+
+    def close(self):
+        """Close the resources owned by the API (thread pool and in-memory hash cache).
+
+        Note:
+            The uploads queued are finished before the resources are closed.
+        """
+        self._executor.shutdown(wait=True)
+        self._queued_uploads = []
+
+        if self._owns_hash_cache:
+            self._hash_cache.close()
+
     #
     # Base methods
     #
@@ -54,37 +154,119 @@ class GEOKnowledgeHubApi:
 
         return response.json()
 
-    def _upload_files(self, files, address):
-        """Upload files to the GEO Knowledge Hub."""
-        # Defining files
-        files_map = {x.name: x for x in files}
-        file_keys = py_.map(files, lambda x: dict(key=x.name))
-
+    def _init_files(self, file_keys, address):
+        """Initialize the files entries in the GEO Knowledge Hub."""
         response = HTTPXClient.request("POST", address, json=file_keys)
         response.raise_for_status()
 
-        file_entries = py_.get(response.json(), "entries", [])
+        return py_.get(response.json(), "entries", [])
 
-        for file_entry in file_entries:
-            file_key = py_.get(file_entry, "key")
-            file_path = files_map[file_key]
+    def _delete_file(self, address):
+        """Delete a file entry from the GEO Knowledge Hub."""
+        response = HTTPXClient.request("DELETE", address)
+        response.raise_for_status()
+
+    def _upload_file(self, file_path, file_entry, address):
+        """Upload and commit a file to the GEO Knowledge Hub."""
+        file_key = py_.get(file_entry, "key")
+
+        # files already hashed (in this run or in previous ones) are not hashed again
+        identity = file_identity(file_path)
+        cached_digests = self._hash_cache.get(identity)
+
+        for attempt in range(self.upload_max_attempts):
+            if attempt:
+                # committed files can't be changed. So, the file entry is
+                # deleted and initialized again before a new upload.
+                self._delete_file(py_.get(file_entry, "links.self"))
+                file_entry = py_.head(self._init_files([dict(key=file_key)], address))
 
             file_content_link = py_.get(file_entry, "links.content")
             file_commit_link = py_.get(file_entry, "links.commit")
 
-            # uploading file
-            response = HTTPXClient.upload("PUT", file_content_link, file_path)
+            if cached_digests:
+                response = HTTPXClient.upload("PUT", file_content_link, file_path)
+                digests = cached_digests
+            else:
+                # uploading file (digests are computed while the bytes are sent)
+                response, digests = HTTPXClient.upload_hashed(
+                    "PUT", file_content_link, file_path
+                )
             response.raise_for_status()
 
             # committing file
             response = HTTPXClient.request("POST", file_commit_link)
             response.raise_for_status()
 
-            del files_map[file_key]
+            # verifying the file committed
+            checksum = py_.get(response.json(), "checksum")
+            verified = _validate_checksum(checksum, digests)
+
+            if verified is not False:
+                break
+
+            # hashing the file again in the next upload
+            cached_digests = None
+        else:
+            raise RuntimeError(f"Invalid checksum for the file `{file_key}`.")
+
+        if verified is None:
+            logger.warning(
+                "File `%s` uploaded without checksum verification.", file_key
+            )
+            return
+
+        # files changed during the upload are not cached
+        if file_identity(file_path) == identity:
+            self._hash_cache.put(identity, digests, file_path)
+
+    def _collect_uploads(self, wait):
+        """Remove the finished uploads from the queue, raising their errors."""
+        uploads = self._queued_uploads
+
+        if wait:
+            self._queued_uploads = []
+        else:
+            self._queued_uploads = py_.filter(uploads, lambda x: not x.done())
+            uploads = py_.filter(uploads, lambda x: x.done())
+
+        for upload in uploads:
+            upload.result()
+
+    def _upload_files(self, files, address, wait=True):
+        """Upload files to the GEO Knowledge Hub."""
+        # Defining files
+        files_map = {x.name: x for x in files}
+        file_keys = py_.map(files, lambda x: dict(key=x.name))
+
+        file_entries = self._init_files(file_keys, address)
+        file_entries = py_.map(
+            file_entries, lambda x: (files_map[py_.get(x, "key")], x)
+        )
+
+        # small files are queued and uploaded concurrently (with the files of other
+        # elements), reusing the connections of the shared client. Large files are
+        # uploaded one by one. Each file still needs its own upload and commit.
+        small_entries, large_entries = py_.partition(
+            file_entries, lambda x: x[0].stat().st_size <= self.concurrent_file_size
+        )
+
+        for file_path, file_entry in small_entries:
+            self._queued_uploads.append(
+                self._executor.submit(self._upload_file, file_path, file_entry, address)
+            )
+
+        for file_path, file_entry in large_entries:
+            self._upload_file(file_path, file_entry, address)
 
-        # validating if all files were uploaded
+        for file_path, _ in file_entries:
+            del files_map[file_path.name]
+
+        # validating if all files were uploaded (or queued)
         assert len(files_map.keys()) == 0, "Error to upload the data"
 
+        self._collect_uploads(wait)
+
     def _load_element(self, address):
         """Load element (Package or Resource) from the GEO Knowledge Hub."""
         response = HTTPXClient.request("GET", address)
@@ -139,6 +321,8 @@ class GEOKnowledgeHubApi:
         metadata: Dict,
         files: List[Path],
         type_: str,
+        reload: bool = True,
+        wait: bool = True,
     ):
         """Upload files to an element (Package or Resource).
 
@@ -148,6 +332,15 @@ class GEOKnowledgeHubApi:
             files (List[Path]): List with path of the files to be uploaded.
 
             type_ (str): Type of the resource to be created (`package` or `resource`).
+
+            reload (bool): Flag indicating if the element should be loaded again from the
+                           GEO Knowledge Hub service after the upload. When ``False``, the
+                           request is not sent and ``metadata`` is returned.
+
+            wait (bool): Flag indicating if the method should wait the upload of the
+                         small files. When ``False``, they are queued and uploaded with
+                         the files of other elements (see ``wait_uploads``). The files
+                         are always waited when ``reload`` is ``True``.
         Returns:
             Dict: Metadata from the GEO Knowledge Hub service.
         """
@@ -157,7 +350,10 @@ class GEOKnowledgeHubApi:
         _validate_url(operation_url)
 
         # uploading file
-        self._upload_files(files, operation_url)
+        self._upload_files(files, operation_url, wait=wait or reload)
+
+        if not reload:
+            return metadata
 
         # reloading package
         operation_url = py_.get(metadata, "links.self")
@@ -176,30 +372,61 @@ class GEOKnowledgeHubApi:
 
         return self._reserve_doi(operation_url)
 
+    def reserve_dois(self, metadata: List[Dict]) -> List[Dict]:
+        """Reserve DOIs for many Packages or Resources concurrently.
+
+        Note:
+            One request is still sent for each element, since the GEO Knowledge Hub
+            doesn't have a bulk endpoint to reserve DOIs.
+
+        Args:
+            metadata (List[Dict]): List of metadata from the GEO Knowledge Hub service.
+        Returns:
+            List[Dict]: Responses of the DOI reservations (in the same order of ``metadata``).
+        """
+        return list(self._executor.map(self.reserve_doi, metadata))
+
+    def wait_uploads(self):
+        """Wait the upload of the files queued by ``upload_files``.
+
+        Raises:
+            Exception: The first error found in the uploads.
+        """
+        self._collect_uploads(wait=True)
+
     def associate_package_resources(
         self, package_metadata: Dict, resources_metadata: List[Dict]
     ) -> Dict:
         """Associate a Package to a list of Resources.
 
         Args:
-            package_metadata (Dict): Package metadata.
+            package_metadata (Dict): Metadata of the package from the GEO Knowledge Hub service.
 
-            resources_metadata (List[Dict]): List of resources metadata.
+            resources_metadata (List[Dict]): List of resources metadata (only the `id` is used).
         Returns:
              Dict: Metadata of the package updated.
+
+        Note:
+            Element definitions (``{"metadata": {...}}``), accepted by the previous
+            versions, are still supported but deprecated.
         """
-        records = py_.map(resources_metadata, lambda x: dict(id=x["metadata"]["id"]))
+        package_metadata = _package_metadata(package_metadata)
+        records = py_.map(resources_metadata, lambda x: dict(id=_resource_id(x)))
 
         # associating resources to the package context.
-        operation_url = py_.get(package_metadata, "metadata.links.context_associate")
+        operation_url = py_.get(package_metadata, "links.context_associate")
+        _validate_url(operation_url)
+
         self._associate_resources_package_context(records, operation_url)
 
         # associating resources to the current version of the package
-        operation_url = py_.get(package_metadata, "metadata.links.resources")
+        operation_url = py_.get(package_metadata, "links.resources")
+        _validate_url(operation_url)
+
         self._associate_resources_package_version(records, operation_url)
 
         # updating the package
-        operation_url = py_.get(package_metadata, "metadata.links.self")
+        operation_url = py_.get(package_metadata, "links.self")
         return self._load_element(operation_url)
 
     def publish(self, metadata: Dict) -> Dict:
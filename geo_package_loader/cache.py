@@ -0,0 +1,233 @@
+#
+# This file is part of GEO Knowledge Hub Package Loader.
+# Copyright (C) 2021-2023 GEO Secretariat.
+#
+# GEO Knowledge Hub Package Loader is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Persistent hash cache for the GEO Knowledge Hub Package Loader."""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+
+def file_identity(file_path: Path) -> Tuple[int, int, int, int]:
+    """Identity of a file (device, inode, size and modification time)."""
+    file_stat = file_path.stat()
+
+    return (
+        file_stat.st_dev,
+        file_stat.st_ino,
+        file_stat.st_size,
+        file_stat.st_mtime_ns,
+    )
+
+
+class HashCache:
+    """Persistent cache of file digests.
+
+    The digests are stored in a SQLite database and indexed by the file
+    identity (device, inode, size and modification time). So, files shared by
+    many resources or packages are hashed only once, and entries are
+    invalidated when the file is changed. When no database file is defined,
+    the digests are kept in memory (valid only for the current run).
+    """
+
+    default_max_entries = 100000
+    """Default maximum number of entries stored in the cache."""
+
+    last_used_flush_size = 1000
+    """Number of entries read before their last use is written."""
+
+    def __init__(
+        self,
+        cache_file: Union[str, Path] = None,
+        max_entries: int = default_max_entries,
+    ):
+        """Initializer.
+
+        Args:
+            cache_file (Union[str, Path]): SQLite file used to store the digests. When
+                                           not defined, the digests are kept in memory.
+
+            max_entries (int): Maximum number of entries stored. The least recently
+                               used entries are evicted when this limit is reached.
+
+        Note:
+            To avoid a write for each read, the last use of the entries and the
+            invalidations are written only in the next ``put`` or ``close``.
+        """
+        if cache_file:
+            cache_file = Path(cache_file)
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+        else:
+            cache_file = ":memory:"
+
+        self._max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(cache_file), check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS digests ("
+            "device INTEGER NOT NULL, "
+            "inode INTEGER NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "mtime_ns INTEGER NOT NULL, "
+            "path TEXT, "
+            "digests TEXT NOT NULL, "
+            "last_used REAL NOT NULL, "
+            "PRIMARY KEY (device, inode))"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS digests_last_used ON digests (last_used)"
+        )
+        self._connection.commit()
+
+        # number of entries stored
+        self._entries = self._connection.execute(
+            "SELECT COUNT(*) FROM digests"
+        ).fetchone()[0]
+
+        # last use of the entries read, written only in the next ``put`` or ``close``
+        self._last_used = {}
+
+    #
+    # Base methods
+    #
+    def _flush_last_used(self):
+        """Write the last use of the entries read."""
+        self._connection.executemany(
+            "UPDATE digests SET last_used = ? WHERE device = ? AND inode = ?",
+            [(value, *key) for key, value in self._last_used.items()],
+        )
+        self._last_used.clear()
+
+    def _evict(self):
+        """Remove the least recently used entries above the size limit."""
+        self._connection.execute(
+            "DELETE FROM digests WHERE rowid IN ("
+            "SELECT rowid FROM digests ORDER BY last_used ASC LIMIT ?)",
+            (self._entries - self._max_entries,),
+        )
+        self._entries = self._max_entries
+
+    #
+    # High-Level methods.
+    #
+    def get(self, identity: Tuple[int, int, int, int]) -> Optional[Dict]:
+        """Get the digests of a file.
+
+        Args:
+            identity (Tuple[int, int, int, int]): File identity (see ``file_identity``).
+        Returns:
+            Optional[Dict]: Hex digests of the file or ``None`` when the file
+                            is not cached or was changed.
+        """
+        device, inode, size, mtime_ns = identity
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT size, mtime_ns, digests FROM digests "
+                "WHERE device = ? AND inode = ?",
+                (device, inode),
+            ).fetchone()
+
+            if not row:
+                return None
+
+            # invalidating changed files (committed in the next ``put`` or ``close``)
+            if row[0] != size or row[1] != mtime_ns:
+                self._connection.execute(
+                    "DELETE FROM digests WHERE device = ? AND inode = ?",
+                    (device, inode),
+                )
+                self._last_used.pop((device, inode), None)
+                self._entries -= 1
+
+                return None
+
+            self._last_used[(device, inode)] = time.time()
+
+            if len(self._last_used) >= self.last_used_flush_size:
+                self._flush_last_used()
+                self._connection.commit()
+
+        return json.loads(row[2])
+
+    def put(
+        self,
+        identity: Tuple[int, int, int, int],
+        digests: Dict,
+        file_path: Union[str, Path] = None,
+    ):
+        """Store the digests of a file.
+
+        Args:
+            identity (Tuple[int, int, int, int]): File identity (see ``file_identity``),
+                                                  taken before the file is hashed.
+
+            digests (Dict): Hex digests of the file (e.g. ``md5`` and ``sha256``).
+
+            file_path (Union[str, Path]): File path (stored for audits).
+        """
+        device, inode, size, mtime_ns = identity
+        file_path = str(file_path) if file_path else None
+
+        with self._lock:
+            exists = self._connection.execute(
+                "SELECT 1 FROM digests WHERE device = ? AND inode = ?",
+                (device, inode),
+            ).fetchone()
+
+            self._last_used.pop((device, inode), None)
+            self._connection.execute(
+                "INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    device,
+                    inode,
+                    size,
+                    mtime_ns,
+                    file_path,
+                    json.dumps(digests),
+                    time.time(),
+                ),
+            )
+            self._flush_last_used()
+
+            if not exists:
+                self._entries += 1
+
+            if self._entries > self._max_entries:
+                self._evict()
+
+            self._connection.commit()
+
+    def entries(self) -> Iterator[Dict]:
+        """Entries of the cache (e.g. to audit the files uploaded).
+
+        Returns:
+            Iterator[Dict]: Entries with the file ``path``, ``size``, ``mtime_ns``
+                            and ``digests``.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT path, size, mtime_ns, digests FROM digests ORDER BY path"
+            ).fetchall()
+
+        for path, size, mtime_ns, digests in rows:
+            yield dict(
+                path=path, size=size, mtime_ns=mtime_ns, digests=json.loads(digests)
+            )
+
+    def close(self):
+        """Close the cache database."""
+        with self._lock:
+            self._flush_last_used()
+
+            self._connection.commit()
+            self._connection.close()
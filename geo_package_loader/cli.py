@@ -51,6 +51,13 @@ def cli():
     type=str,
     help="Directory where the knowledge-package.json file is defined.",
 )
+@click.option(
+    "-c",
+    "--hash-cache",
+    required=False,
+    type=str,
+    help="SQLite file used to cache the digests of the uploaded files.",
+)
 def load(
     verbose,
     publish,
@@ -58,6 +65,7 @@ def load(
     records_api,
     access_token,
     knowledge_package_repository,
+    hash_cache,
 ):
     """Load the metadata and resources of a Knowledge Package."""
 
@@ -95,6 +103,7 @@ def load(
         access_token=access_token,
         package_api=packages_api,
         record_api=records_api,
+        hash_cache_file=hash_cache,
     )
 
     sleep(1)
@@ -117,3 +126,5 @@ def load(
     except Exception as e:
         click.secho("Error to load the package!", bold=True, fg="red")
         click.secho(str(e), bold=True, fg="red")
+    finally:
+        loader.close()
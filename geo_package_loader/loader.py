@@ -8,7 +8,12 @@
 
 """GEO Knowledge Hub Package Loader."""
 
+from pathlib import Path
+from typing import Union
+
 from geo_package_loader.api import GEOKnowledgeHubApi
+from geo_package_loader.cache import HashCache
+from geo_package_loader.network import HTTPXClient
 from geo_package_loader.service import PackageLoaderService
 from geo_package_loader.store import TokenStore
 
@@ -20,7 +25,13 @@ class PackageLoader:
     to upload and publish complete Knowledge Packages.
     """
 
-    def __init__(self, access_token: str, package_api: str, record_api: str):
+    def __init__(
+        self,
+        access_token: str,
+        package_api: str,
+        record_api: str,
+        hash_cache_file: Union[str, Path] = None,
+    ):
         """Initializer.
 
         Args:
@@ -29,14 +40,40 @@ class PackageLoader:
             package_api (str): Address to the Package API.
 
             record_api (str): Address to the Record API.
+
+            hash_cache_file (Union[str, Path]): SQLite file used to cache the digests
+                                                of the files uploaded. When not defined,
+                                                the digests are kept in memory.
         """
         # Configuring the token store
         TokenStore.save_token(access_token)
 
+        # Configuring the hash cache (in memory when no file is defined)
+        self._hash_cache = HashCache(hash_cache_file)
+
         # Defining API
-        self._api = GEOKnowledgeHubApi(package_api, record_api)
+        self._api = GEOKnowledgeHubApi(package_api, record_api, self._hash_cache)
+
+    def __enter__(self):
+        """Enter the runtime context of the Package Loader."""
+        return self
+
+    def __exit__(self, *args):
+        """Exit the runtime context of the Package Loader, closing its resources."""
+        self.close()
+
+    @property
+    def hash_cache(self):
+        """Cache with the digests of the files uploaded and verified."""
+        return self._hash_cache
 
     @property
     def service(self):
         """Package Loader service accessor."""
         return PackageLoaderService(self._api)
+
+    def close(self):
+        """Close the resources (hash cache and HTTP client) used by the Package Loader."""
+        self._api.close()
+        self._hash_cache.close()
+        HTTPXClient.close()
@@ -8,17 +8,75 @@
 
 """Network module for the GEO Knowledge Hub Package Loader."""
 
+import hashlib
+import threading
+
 import httpx
 from pydash import py_
 
 from .store import TokenStore
 
 
+class HashingFileReader:
+    """File reader that computes the digests of the bytes while they are read.
+
+    This reader is used to stream files to the GEO Knowledge Hub service and
+    compute their digests in the same pass, without a second read of the file.
+    """
+
+    chunk_size = 64 * 1024
+    """Size of the chunks read from the file."""
+
+    def __init__(self, file_obj, algorithms=("md5", "sha256")):
+        """Initializer.
+
+        Args:
+            file_obj (io.BufferedReader): File opened in binary mode.
+
+            algorithms (tuple): Names of the ``hashlib`` algorithms used.
+        """
+        self._file_obj = file_obj
+        self._hashes = {algorithm: hashlib.new(algorithm) for algorithm in algorithms}
+
+    def read(self, size=-1):
+        """Read bytes from the file and update the digests."""
+        chunk = self._file_obj.read(size)
+
+        for hash_ in self._hashes.values():
+            hash_.update(chunk)
+
+        return chunk
+
+    def fileno(self):
+        """File descriptor (used by ``httpx`` to define the ``Content-Length``)."""
+        return self._file_obj.fileno()
+
+    def __iter__(self):
+        """Iterate over the file chunks."""
+        chunk = self.read(self.chunk_size)
+
+        while chunk:
+            yield chunk
+            chunk = self.read(self.chunk_size)
+
+    @property
+    def digests(self):
+        """Hex digests of the bytes read so far."""
+        return {
+            algorithm: hash_.hexdigest() for algorithm, hash_ in self._hashes.items()
+        }
+
+
 class HTTPXClient:
 
     _client_config = {"timeout": 12, "verify": False}
     """Default client config."""
 
+    _client = None
+    """Shared ``httpx.Client`` (connections are reused between requests)."""
+
+    _client_lock = threading.Lock()
+
     @classmethod
     def _proxy_request(cls, request_options):
         """Proxy a request to add the authentication access token."""
@@ -33,10 +91,32 @@ class HTTPXClient:
             )
         return request_options
 
+    @classmethod
+    def _get_client(cls):
+        """Get the shared ``httpx.Client``, creating it if needed."""
+        with cls._client_lock:
+            if cls._client is None:
+                cls._client = httpx.Client(**cls._client_config)
+
+            return cls._client
+
+    @classmethod
+    def close(cls):
+        """Close the shared ``httpx.Client`` and its connections."""
+        with cls._client_lock:
+            if cls._client is not None:
+                cls._client.close()
+                cls._client = None
+
     @classmethod
     def set_client_config(cls, configuration):
         """Define the configuration for the ``httpx.Client``.
 
+        Note:
+            The shared ``httpx.Client`` is closed and created again with the new
+            configuration. So, this method must not be called while requests
+            (e.g., uploads) are running.
+
         Args:
             configuration (dict): ``httpx.Client`` configuration
 
@@ -44,6 +124,7 @@ class HTTPXClient:
             For more details about the ``httpx.Client``, please check the
             official documentation: https://www.python-httpx.org/api/#client
         """
+        cls.close()
         cls._client_config = configuration
 
     @classmethod
@@ -65,12 +146,12 @@ class HTTPXClient:
             This method is built on top of ``httpx``. For more details of options available, please,
             check the official documentation: https://www.python-httpx.org/
         """
-        with httpx.Client(**cls._client_config) as client:
-            return client.request(method, url, **cls._proxy_request(kwargs or {}))
+        client = cls._get_client()
+        return client.request(method, url, **cls._proxy_request(kwargs or {}))
 
     @staticmethod
     def upload(method, url, file_path, **kwargs):
-        """Download a file.
+        """Upload a file.
 
         Args:
 
@@ -89,6 +170,34 @@ class HTTPXClient:
             For more details about ``http.Client.request`` options, please check
             the official documentation: https://www.python-httpx.org/api/#client
         """
-        return HTTPXClient.request(
-            method=method, url=url, data=file_path.open("rb"), **kwargs
-        )
+        with file_path.open("rb") as file_obj:
+            return HTTPXClient.request(
+                method=method, url=url, content=file_obj, **kwargs
+            )
+
+    @staticmethod
+    def upload_hashed(method, url, file_path, **kwargs):
+        """Upload a file computing its digests while the bytes are sent.
+
+        Args:
+
+            method (str): HTTP verb used to upload the data.
+
+            url (str): URL to send the data.
+
+            file_path (pathlib.Path): File path.
+
+            kwargs (dict): Extra parameters to ``http.Client.request``.
+
+        Returns:
+            Tuple[httpx.Response, dict]: Request response and the hex digests
+                                         (``md5`` and ``sha256``) of the bytes sent.
+        """
+        with file_path.open("rb") as file_obj:
+            reader = HashingFileReader(file_obj)
+
+            response = HTTPXClient.request(
+                method=method, url=url, content=reader, **kwargs
+            )
+
+        return response, reader.digests
@@ -15,6 +15,7 @@ from typing import Union, Dict
 
 from geo_package_loader.api import GEOKnowledgeHubApi
 from geo_package_loader.repository import load_package_repository
+from geo_package_loader.state import ElementState
 
 
 class PackageLoaderService:
@@ -37,26 +38,45 @@ class PackageLoaderService:
     # Base methods
     #
     def _load_element(self, element_definition, type_):
-        """Load an element to the GEO Knowledge Hub service."""
-        include_doi = py_.get(element_definition, "options.include_doi", False)
+        """Load an element to the GEO Knowledge Hub service.
 
+        Note:
+            The full records returned by the service are dropped as soon as
+            they are used. Only a compact ``ElementState`` is kept. DOIs are
+            reserved later, when the drafts of all elements exist, and small
+            files are uploaded in background.
+        """
         # create draft
-        element_definition["metadata"] = self._api.create_draft(
-            element_definition["metadata"], type_
+        element = ElementState.from_metadata(
+            self._api.create_draft(element_definition.pop("metadata"), type_), type_
+        )
+
+        # upload files. The small files are queued and uploaded with the files of
+        # the other elements. The element is not reloaded (its state doesn't change).
+        self._api.upload_files(
+            element.as_metadata(),
+            element_definition.pop("files"),
+            type_,
+            reload=False,
+            wait=False,
         )
 
-        # upload files
-        element_definition["metadata"] = self._api.upload_files(
-            element_definition["metadata"], element_definition["files"], type_
+        return element
+
+    def _reserve_dois(self, element_definitions, elements):
+        """Reserve the DOIs of the elements concurrently."""
+        elements = py_.map(
+            py_.filter(
+                list(zip(element_definitions, elements)),
+                lambda x: py_.get(x[0], "options.include_doi", False),
+            ),
+            lambda x: x[1],
         )
 
-        # include DOI
-        if include_doi:
-            element_definition["metadata"] = self._api.reserve_doi(
-                element_definition["metadata"]
-            )
+        dois = self._api.reserve_dois(py_.map(elements, lambda x: x.as_metadata()))
 
-        return element_definition
+        for element, doi in zip(elements, dois):
+            element.update_doi(doi)
 
     #
     # High-Level methods.
@@ -92,10 +112,22 @@ class PackageLoaderService:
             lambda resource: self._load_element(resource, type_="resource"),
         )
 
+        # reserving DOIs (after all drafts are created)
+        self._reserve_dois(
+            [package_definition["knowledge_package"], *package_definition["resources"]],
+            [package, *resources],
+        )
+
+        # waiting the files queued
+        self._api.wait_uploads()
+
         # associating packages and resources.
-        self._api.associate_package_resources(package, resources)
+        package_metadata = self._api.associate_package_resources(
+            package.as_metadata(), py_.map(resources, lambda x: x.as_metadata())
+        )
+        package.update(package_metadata)
 
         if publish:
-            package["metadata"] = self._api.publish(package)
+            package_metadata = self._api.publish(package.as_metadata())
 
-        return package["metadata"]
+        return package_metadata
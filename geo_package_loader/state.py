@@ -0,0 +1,96 @@
+#
+# This file is part of GEO Knowledge Hub Package Loader.
+# Copyright (C) 2021-2023 GEO Secretariat.
+#
+# GEO Knowledge Hub Package Loader is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Compact element state for the GEO Knowledge Hub Package Loader."""
+
+from typing import Dict
+
+from pydash import py_
+
+
+class ElementState:
+    """Compact state of an element (Package or Resource) being loaded.
+
+    Instead of keeping the full record returned by the GEO Knowledge Hub
+    service, only the fields required by the next loading steps are kept.
+    This keeps the memory usage bounded when a package has many resources.
+    """
+
+    __slots__ = ("id", "type_", "links", "doi", "status")
+
+    links_used = (
+        "self",
+        "files",
+        "reserve_doi",
+        "publish",
+        "context_associate",
+        "resources",
+    )
+    """Links used by the loading steps."""
+
+    def __init__(self, type_: str):
+        """Initializer.
+
+        Args:
+            type_ (str): Type of the element (`package` or `resource`).
+        """
+        self.id = None
+        self.type_ = type_
+        self.links = {}
+        self.doi = None
+        self.status = None
+
+    @classmethod
+    def from_metadata(cls, metadata: Dict, type_: str) -> "ElementState":
+        """Create a state from the metadata of the GEO Knowledge Hub service.
+
+        Args:
+            metadata (Dict): Metadata from the GEO Knowledge Hub service.
+
+            type_ (str): Type of the element (`package` or `resource`).
+        Returns:
+            ElementState: Compact state of the element.
+        """
+        state = cls(type_)
+        state.update(metadata)
+
+        return state
+
+    def update(self, metadata: Dict):
+        """Update the state using the metadata of the GEO Knowledge Hub service.
+
+        Args:
+            metadata (Dict): Metadata from the GEO Knowledge Hub service.
+        """
+        self.id = py_.get(metadata, "id", self.id)
+        self.doi = py_.get(metadata, "pids.doi.identifier", self.doi)
+        self.status = py_.get(metadata, "status", self.status)
+
+        links = py_.get(metadata, "links", {})
+        self.links = {
+            link: links.get(link, self.links.get(link))
+            for link in self.links_used
+            if link in links or link in self.links
+        }
+
+    def update_doi(self, doi: Dict):
+        """Update the state using the response of a DOI reservation.
+
+        Args:
+            doi (Dict): DOI reserved in the GEO Knowledge Hub service
+                        (e.g. ``{"identifier": "10.0000/abc", "provider": "datacite"}``).
+        """
+        self.doi = py_.get(doi, "identifier", self.doi)
+
+    def as_metadata(self) -> Dict:
+        """Minimal metadata accepted by the ``GEOKnowledgeHubApi`` methods.
+
+        Returns:
+            Dict: Metadata with the element id and links.
+        """
+        return dict(id=self.id, links=dict(self.links))
@@ -9,6 +9,6 @@
 
 pydocstyle geo_package_loader setup.py && \
 isort geo_package_loader setup.py --check-only --diff && \
-check-manifest --ignore ".travis.yml,.drone.yml,.readthedocs.yml,.editorconfig" #&& \
+check-manifest --ignore ".travis.yml,.drone.yml,.readthedocs.yml,.editorconfig" && \
 #sphinx-build -qnW --color -b doctest docs/sphinx/ docs/sphinx/_build/doctest && \
-#pytest
+pytest
@@ -0,0 +1,242 @@
+#
+# This file is part of GEO Knowledge Hub Package Loader.
+# Copyright (C) 2021-2023 GEO Secretariat.
+#
+# GEO Knowledge Hub Package Loader is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Pytest configuration for the GEO Knowledge Hub Package Loader."""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import Counter
+
+import httpx
+import pytest
+
+from geo_package_loader.api import GEOKnowledgeHubApi
+from geo_package_loader.network import HTTPXClient
+from geo_package_loader.store import TokenStore
+
+HUB_URL = "http://hub/api"
+
+
+class MockHub:
+    """In-memory GEO Knowledge Hub used through ``httpx.MockTransport``."""
+
+    def __init__(self, record_padding=0, latency=0):
+        """Initializer.
+
+        Args:
+            record_padding (int): Size of the extra content added to the records
+                                  returned, to simulate large records.
+
+            latency (float): Time (in seconds) spent by each request, to simulate
+                             the network round trip.
+        """
+        self.record_padding = record_padding
+        self.latency = latency
+
+        # maximum number of requests handled at the same time
+        self.max_concurrency = 0
+        self._concurrency = 0
+        self._lock = threading.Lock()
+
+        self.requests = Counter()
+        self.files = {}
+        self.bad_checksums = 0
+        self.checksum_algorithm = "md5"
+
+        self._next_id = 0
+
+    def _record(self, id_):
+        """Record returned by the service."""
+        url = f"{HUB_URL}/records/{id_}"
+
+        return {
+            "id": id_,
+            "status": "draft",
+            "links": {
+                "self": f"{url}/draft",
+                "files": f"{url}/draft/files",
+                "reserve_doi": f"{url}/draft/pids/doi",
+                "publish": f"{url}/draft/actions/publish",
+                "context_associate": f"{url}/context/actions/associate",
+                "resources": f"{url}/draft/resources",
+            },
+            "padding": "x" * self.record_padding,
+        }
+
+    def _file_entry(self, id_, key):
+        """File entry returned by the service."""
+        url = f"{HUB_URL}/records/{id_}/draft/files/{key}"
+
+        return {
+            "key": key,
+            "links": {
+                "self": url,
+                "content": f"{url}/content",
+                "commit": f"{url}/commit",
+            },
+        }
+
+    def _checksum(self, id_, key):
+        """Checksum of a file committed."""
+        if not self.checksum_algorithm:
+            return None
+
+        if self.bad_checksums:
+            self.bad_checksums -= 1
+            return f"{self.checksum_algorithm}:invalid"
+
+        digest = hashlib.new(self.checksum_algorithm, self.files[(id_, key)])
+        return f"{self.checksum_algorithm}:{digest.hexdigest()}"
+
+    def handler(self, request):
+        """Handle a request (thread-safe)."""
+        with self._lock:
+            self._concurrency += 1
+            self.max_concurrency = max(self.max_concurrency, self._concurrency)
+
+        time.sleep(self.latency)
+
+        with self._lock:
+            self._concurrency -= 1
+
+            return self._handle(request)
+
+    def _handle(self, request):
+        """Handle a request."""
+        method, path = request.method, request.url.path
+
+        match = re.match(
+            r"/api/(?:packages|records)(?:/(?P<id>\w+)(?P<op>/.*)?)?$", path
+        )
+        id_, op = match.group("id"), match.group("op") or ""
+
+        # files operations
+        file_match = re.match(r"/draft/files/(?P<key>[^/]+)(?P<op>/\w+)?$", op)
+
+        if file_match:
+            key, file_op = file_match.group("key"), file_match.group("op")
+            self.requests[(method, f"file{file_op or ''}")] += 1
+
+            if file_op == "/content":
+                if (id_, key) in self.files:
+                    return httpx.Response(400, json={"message": "Already committed."})
+
+                self.files[(id_, key)] = request.read()
+                return httpx.Response(200, json={"key": key})
+
+            if file_op == "/commit":
+                checksum = self._checksum(id_, key)
+                return httpx.Response(200, json={"key": key, "checksum": checksum})
+
+            # deleting the file entry
+            self.files.pop((id_, key), None)
+            return httpx.Response(204)
+
+        self.requests[(method, re.sub(r"^/draft", "", op) or "record")] += 1
+
+        if not id_:
+            self._next_id += 1
+            return httpx.Response(201, json=self._record(f"id{self._next_id}"))
+
+        if op == "/draft/files":
+            entries = [
+                self._file_entry(id_, x["key"]) for x in json.loads(request.read())
+            ]
+            return httpx.Response(201, json={"entries": entries})
+
+        if op == "/draft/pids/doi":
+            return httpx.Response(201, json={"identifier": f"10.0000/{id_}"})
+
+        if op == "/draft/actions/publish":
+            return httpx.Response(
+                202, json={**self._record(id_), "status": "published"}
+            )
+
+        if op in ("/context/actions/associate", "/draft/resources"):
+            return httpx.Response(204)
+
+        return httpx.Response(200, json=self._record(id_))
+
+
+@pytest.fixture()
+def hub():
+    """Mock GEO Knowledge Hub configured in the ``HTTPXClient``."""
+    client_config = HTTPXClient._client_config
+
+    hub = MockHub()
+
+    TokenStore.save_token("token")
+    HTTPXClient.set_client_config({"transport": httpx.MockTransport(hub.handler)})
+
+    yield hub
+
+    HTTPXClient.set_client_config(client_config)
+
+
+@pytest.fixture()
+def hub_url():
+    """Address of the mock GEO Knowledge Hub API."""
+    return HUB_URL
+
+
+@pytest.fixture()
+def api(hub, hub_url):
+    """GEO Knowledge Hub API."""
+    api = GEOKnowledgeHubApi(f"{hub_url}/packages", f"{hub_url}/records")
+
+    yield api
+
+    api.close()
+
+
+@pytest.fixture()
+def make_package_repository(tmp_path_factory):
+    """Factory of Knowledge Package repositories."""
+
+    def factory(resources=1, files=1, include_doi=True):
+        tmp_path = tmp_path_factory.mktemp("package")
+        resources_definition = []
+
+        (tmp_path / "package.json").write_text(json.dumps({"title": "package"}))
+        (tmp_path / "package.csv").write_text("a,b\n1,2\n")
+
+        for idx in range(resources):
+            (tmp_path / f"resource-{idx}.json").write_text(json.dumps({"idx": idx}))
+
+            for file_idx in range(files):
+                (tmp_path / f"resource-{idx}-{file_idx}.csv").write_text(
+                    f"{idx},{file_idx}\n"
+                )
+
+            resources_definition.append(
+                {
+                    "metadata_file": f"resource-{idx}.json",
+                    "files": [f"resource-{idx}-{x}.csv" for x in range(files)],
+                    "options": {"include_doi": include_doi},
+                }
+            )
+
+        (tmp_path / "knowledge-package.json").write_text(
+            json.dumps(
+                {
+                    "knowledge_package": {
+                        "metadata_file": "package.json",
+                        "files": ["package.csv"],
+                        "options": {"include_doi": include_doi},
+                    },
+                    "resources": resources_definition,
+                }
+            )
+        )
+
+        return tmp_path
+
+    return factory
@@ -0,0 +1,152 @@
+#
+# This file is part of GEO Knowledge Hub Package Loader.
+# Copyright (C) 2021-2023 GEO Secretariat.
+#
+# GEO Knowledge Hub Package Loader is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Tests for the GEO Knowledge Hub API client."""
+
+import hashlib
+
+import pytest
+
+from geo_package_loader.cache import file_identity
+from geo_package_loader.network import HTTPXClient
+
+
+@pytest.fixture()
+def data_file(tmp_path):
+    """File to be uploaded."""
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("a,b\n1,2\n")
+
+    return file_path
+
+
+def test_upload_files(api, hub, data_file):
+    draft = api.create_draft({}, "resource")
+    api.upload_files(draft, [data_file], "resource")
+
+    assert hub.files[("id1", "data.csv")] == data_file.read_bytes()
+    digests = {
+        "md5": hashlib.md5(data_file.read_bytes()).hexdigest(),
+        "sha256": hashlib.sha256(data_file.read_bytes()).hexdigest(),
+    }
+    stat = data_file.stat()
+
+    assert api.hash_cache.get(file_identity(data_file)) == digests
+    assert list(api.hash_cache.entries()) == [
+        dict(
+            path=str(data_file),
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            digests=digests,
+        )
+    ]
+
+
+def test_upload_files_with_invalid_checksum(api, hub, data_file):
+    hub.bad_checksums = 1
+
+    draft = api.create_draft({}, "resource")
+    api.upload_files(draft, [data_file], "resource")
+
+    # the file entry is deleted and initialized again before the new upload
+    assert hub.requests[("DELETE", "file")] == 1
+    assert hub.requests[("POST", "/files")] == 2
+    assert hub.requests[("PUT", "file/content")] == 2
+    assert hub.requests[("POST", "file/commit")] == 2
+
+    assert hub.files[("id1", "data.csv")] == data_file.read_bytes()
+    assert api.hash_cache.get(file_identity(data_file))
+
+
+def test_upload_files_with_always_invalid_checksum(api, hub, data_file):
+    hub.bad_checksums = api.upload_max_attempts
+
+    draft = api.create_draft({}, "resource")
+
+    with pytest.raises(RuntimeError, match="Invalid checksum"):
+        api.upload_files(draft, [data_file], "resource")
+
+    assert api.hash_cache.get(file_identity(data_file)) is None
+
+
+@pytest.mark.parametrize("checksum_algorithm", [None, "sha1"])
+def test_upload_files_without_verification(api, hub, data_file, checksum_algorithm):
+    hub.checksum_algorithm = checksum_algorithm
+
+    draft = api.create_draft({}, "resource")
+    api.upload_files(draft, [data_file], "resource")
+
+    # files not verified are not recorded
+    assert hub.files[("id1", "data.csv")] == data_file.read_bytes()
+    assert api.hash_cache.get(file_identity(data_file)) is None
+
+
+def test_upload_shared_files_are_hashed_once(api, hub, data_file, monkeypatch):
+    upload_hashed = HTTPXClient.upload_hashed
+    calls = []
+
+    def upload_hashed_wrapper(*args, **kwargs):
+        calls.append(args)
+        return upload_hashed(*args, **kwargs)
+
+    monkeypatch.setattr(HTTPXClient, "upload_hashed", upload_hashed_wrapper)
+
+    for _ in range(3):
+        draft = api.create_draft({}, "resource")
+        api.upload_files(draft, [data_file], "resource")
+
+    assert len(calls) == 1
+    assert hub.requests[("PUT", "file/content")] == 3
+    assert hub.requests[("POST", "file/commit")] == 3
+
+
+def test_upload_files_changed_during_upload(api, hub, data_file, monkeypatch):
+    upload_hashed = HTTPXClient.upload_hashed
+    identity = file_identity(data_file)
+
+    def upload_hashed_wrapper(*args, **kwargs):
+        response = upload_hashed(*args, **kwargs)
+
+        with data_file.open("a") as file_obj:
+            file_obj.write("3,4\n")
+
+        return response
+
+    monkeypatch.setattr(HTTPXClient, "upload_hashed", upload_hashed_wrapper)
+
+    draft = api.create_draft({}, "resource")
+    api.upload_files(draft, [data_file], "resource")
+
+    # digests of the bytes uploaded are not cached with the new identity
+    assert api.hash_cache.get(identity) is None
+    assert api.hash_cache.get(file_identity(data_file)) is None
+
+
+def test_upload_files_queued(api, hub, data_file):
+    drafts = [api.create_draft({}, "resource") for _ in range(3)]
+
+    for draft in drafts:
+        api.upload_files(draft, [data_file], "resource", reload=False, wait=False)
+
+    api.wait_uploads()
+
+    assert len(hub.files) == 3
+    assert hub.requests[("GET", "record")] == 0
+
+
+def test_upload_files_queued_with_error(api, hub, data_file):
+    hub.bad_checksums = api.upload_max_attempts
+
+    draft = api.create_draft({}, "resource")
+    api.upload_files(draft, [data_file], "resource", reload=False, wait=False)
+
+    with pytest.raises(RuntimeError, match="Invalid checksum"):
+        api.wait_uploads()
+
+    # errors are raised only once
+    api.wait_uploads()
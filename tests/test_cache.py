@@ -0,0 +1,120 @@
+#
+# This file is part of GEO Knowledge Hub Package Loader.
+# Copyright (C) 2021-2023 GEO Secretariat.
+#
+# GEO Knowledge Hub Package Loader is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Tests for the hash cache."""
+
+import os
+
+from geo_package_loader.cache import HashCache, file_identity
+
+DIGESTS = {"md5": "md5-digest", "sha256": "sha256-digest"}
+
+
+def test_get_and_put(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("a,b\n")
+
+    cache = HashCache()
+    identity = file_identity(file_path)
+
+    assert cache.get(identity) is None
+
+    cache.put(identity, DIGESTS)
+    assert cache.get(identity) == DIGESTS
+
+
+def test_invalidation(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("a,b\n")
+
+    cache = HashCache()
+    cache.put(file_identity(file_path), DIGESTS)
+
+    file_path.write_text("a,b,c\n")
+    assert cache.get(file_identity(file_path)) is None
+
+    # same size, different modification time
+    cache.put(file_identity(file_path), DIGESTS)
+
+    stat = file_path.stat()
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    assert cache.get(file_identity(file_path)) is None
+
+
+def test_eviction(tmp_path):
+    cache = HashCache(max_entries=2)
+
+    identities = []
+    for idx in range(3):
+        file_path = tmp_path / f"data-{idx}.csv"
+        file_path.write_text(str(idx))
+
+        identities.append(file_identity(file_path))
+        cache.put(identities[-1], DIGESTS)
+
+    # the least recently used entry is evicted
+    assert cache.get(identities[0]) is None
+    assert cache.get(identities[1]) == DIGESTS
+    assert cache.get(identities[2]) == DIGESTS
+
+
+def test_persistence(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("a,b\n")
+
+    cache_file = tmp_path / "cache" / "hashes.sqlite3"
+
+    cache = HashCache(cache_file)
+    cache.put(file_identity(file_path), DIGESTS)
+    cache.close()
+
+    cache = HashCache(cache_file)
+    assert cache.get(file_identity(file_path)) == DIGESTS
+    cache.close()
+
+
+def test_eviction_uses_last_read(tmp_path):
+    cache = HashCache(max_entries=2)
+
+    identities = []
+    for idx in range(3):
+        file_path = tmp_path / f"data-{idx}.csv"
+        file_path.write_text(str(idx))
+
+        identities.append(file_identity(file_path))
+
+    cache.put(identities[0], DIGESTS)
+    cache.put(identities[1], DIGESTS)
+
+    # reading the first entry makes it the most recently used
+    assert cache.get(identities[0]) == DIGESTS
+
+    cache.put(identities[2], DIGESTS)
+
+    assert cache.get(identities[0]) == DIGESTS
+    assert cache.get(identities[1]) is None
+    assert cache.get(identities[2]) == DIGESTS
+
+
+def test_get_does_not_write(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("a,b\n")
+
+    cache = HashCache(tmp_path / "hashes.sqlite3")
+    cache.put(file_identity(file_path), DIGESTS)
+
+    total_changes = cache._connection.total_changes
+
+    for _ in range(10):
+        assert cache.get(file_identity(file_path)) == DIGESTS
+
+    assert cache._connection.total_changes == total_changes
+    assert not cache._connection.in_transaction
+
+    cache.close()
@@ -0,0 +1,30 @@
+#
+# This file is part of GEO Knowledge Hub Package Loader.
+# Copyright (C) 2021-2023 GEO Secretariat.
+#
+# GEO Knowledge Hub Package Loader is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Tests for the Package Loader."""
+
+import sqlite3
+
+import pytest
+
+from geo_package_loader import PackageLoader
+
+
+def test_package_loader_context(hub, hub_url, tmp_path, make_package_repository):
+    hash_cache_file = tmp_path / "hashes.sqlite3"
+
+    with PackageLoader(
+        "token", f"{hub_url}/packages", f"{hub_url}/records", hash_cache_file
+    ) as loader:
+        loader.service.load_package(make_package_repository(resources=2))
+
+    assert hash_cache_file.is_file()
+
+    # resources are closed when leaving the context
+    with pytest.raises(sqlite3.ProgrammingError):
+        loader._hash_cache.get((0, 0, 0, 0))
@@ -0,0 +1,59 @@
+#
+# This file is part of GEO Knowledge Hub Package Loader.
+# Copyright (C) 2021-2023 GEO Secretariat.
+#
+# GEO Knowledge Hub Package Loader is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Tests for the network module."""
+
+import hashlib
+
+import httpx
+
+from geo_package_loader.network import HashingFileReader, HTTPXClient
+
+
+def test_hashing_file_reader(tmp_path):
+    file_path = tmp_path / "data.bin"
+    file_path.write_bytes(b"geo" * 100000)
+
+    with file_path.open("rb") as file_obj:
+        reader = HashingFileReader(file_obj)
+        content = b"".join(reader)
+
+    assert content == file_path.read_bytes()
+    assert reader.digests == {
+        "md5": hashlib.md5(content).hexdigest(),
+        "sha256": hashlib.sha256(content).hexdigest(),
+    }
+
+
+def test_upload_hashed(hub, tmp_path):
+    file_path = tmp_path / "data.bin"
+    file_path.write_bytes(b"geo" * 100000)
+
+    requests = []
+
+    def handler(request):
+        requests.append((request.headers, request.read()))
+        return httpx.Response(200)
+
+    HTTPXClient.set_client_config({"transport": httpx.MockTransport(handler)})
+
+    response, digests = HTTPXClient.upload_hashed(
+        "PUT", "http://hub/api/files/data.bin/content", file_path
+    )
+    assert response.status_code == 200
+
+    headers, content = requests[0]
+
+    assert content == file_path.read_bytes()
+    assert headers["Content-Length"] == str(file_path.stat().st_size)
+    assert "Transfer-Encoding" not in headers
+
+    assert digests == {
+        "md5": hashlib.md5(content).hexdigest(),
+        "sha256": hashlib.sha256(content).hexdigest(),
+    }
@@ -0,0 +1,186 @@
+#
+# This file is part of GEO Knowledge Hub Package Loader.
+# Copyright (C) 2021-2023 GEO Secretariat.
+#
+# GEO Knowledge Hub Package Loader is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Tests for the Package Loader service."""
+
+import time
+import tracemalloc
+
+import httpx
+import pytest
+from pydash import py_
+
+from geo_package_loader.network import HTTPXClient
+from geo_package_loader.repository import load_package_repository
+from geo_package_loader.service import PackageLoaderService
+
+
+def _load_package_peak_memory(api, package_repository):
+    """Peak memory (in bytes) used to load a package."""
+    tracemalloc.start()
+
+    try:
+        PackageLoaderService(api).load_package(package_repository, publish=False)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_load_package(api, hub, make_package_repository):
+    package_repository = make_package_repository(resources=3)
+
+    package = PackageLoaderService(api).load_package(package_repository, publish=True)
+
+    assert package["id"] == "id1"
+    assert package["status"] == "published"
+
+    assert hub.requests[("POST", "record")] == 4
+    assert hub.requests[("POST", "/pids/doi")] == 4
+    assert hub.requests[("POST", "/context/actions/associate")] == 1
+    assert hub.requests[("POST", "/resources")] == 1
+    assert hub.requests[("POST", "/actions/publish")] == 1
+    assert len(hub.files) == 4
+
+
+def test_associate_package_resources_with_element_definitions(api, hub):
+    package = api.create_draft({}, "package")
+    resource = api.create_draft({}, "resource")
+
+    # element definitions, used by the previous versions, are still accepted
+    package = api.associate_package_resources(
+        {"metadata": package}, [{"metadata": resource}]
+    )
+
+    assert package["id"] == "id1"
+    assert hub.requests[("POST", "/context/actions/associate")] == 1
+
+
+def test_associate_package_resources_with_resources_ids(api, hub):
+    package = api.create_draft({}, "package")
+
+    # resources identified only by their ids
+    package = api.associate_package_resources(package, [{"id": "abc"}, {"id": "def"}])
+
+    assert package["id"] == "id1"
+    assert hub.requests[("POST", "/context/actions/associate")] == 1
+
+
+def test_load_package_memory_is_bounded(api, hub, make_package_repository):
+    """Benchmark: peak memory doesn't grow with the size of the records."""
+    hub.record_padding = 256 * 1024
+
+    peaks = {}
+    for resources in (10, 100):
+        peaks[resources] = _load_package_peak_memory(
+            api, make_package_repository(resources=resources)
+        )
+
+    print(f"Peak memory (10 resources): {peaks[10] / 1024:.0f} KiB")
+    print(f"Peak memory (100 resources): {peaks[100] / 1024:.0f} KiB")
+
+    # keeping all records would use more than 25 MB for 100 resources
+    assert peaks[100] < 2 * peaks[10]
+    assert peaks[100] < 100 * hub.record_padding / 4
+
+
+def _load_package(api, package_repository):
+    """Load a package using the ``PackageLoaderService``."""
+    return PackageLoaderService(api).load_package(package_repository, publish=False)
+
+
+def _load_package_per_element(api, package_repository):
+    """Load a package using the previous approach (one element after another).
+
+    Each element is created, has its files uploaded (waiting them), is reloaded
+    and has its DOI reserved before the next element is loaded.
+    """
+    package_definition = load_package_repository(package_repository)
+
+    def load_element(element_definition, type_):
+        metadata = api.create_draft(element_definition["metadata"], type_)
+        metadata = api.upload_files(metadata, element_definition["files"], type_)
+
+        if py_.get(element_definition, "options.include_doi", False):
+            api.reserve_doi(metadata)
+
+        return metadata
+
+    package = load_element(package_definition["knowledge_package"], "package")
+    resources = py_.map(
+        package_definition["resources"], lambda x: load_element(x, "resource")
+    )
+
+    return api.associate_package_resources(package, resources)
+
+
+@pytest.mark.parametrize("resources,files", [(20, 1), (10, 5)])
+def test_load_package_requests(
+    api, hub, make_package_repository, monkeypatch, resources, files
+):
+    """Benchmark: requests and serial round trips per file.
+
+    The package is loaded with the previous approach and with the current one,
+    in a hub with latency. The case with one small file per resource shows
+    that the uploads of different elements are done concurrently.
+    """
+    clients = []
+
+    class Client(httpx.Client):
+        def __init__(self, *args, **kwargs):
+            clients.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(httpx, "Client", Client)
+    HTTPXClient.close()
+
+    hub.latency = 0.005
+    total_files = resources * files + 1
+
+    results = {}
+    for name, load in (
+        ("per element", _load_package_per_element),
+        ("current", _load_package),
+    ):
+        hub.requests.clear()
+        hub.max_concurrency = 0
+
+        start = time.perf_counter()
+        load(api, make_package_repository(resources=resources, files=files))
+        elapsed = time.perf_counter() - start
+
+        requests = sum(hub.requests.values())
+        control_requests = requests - hub.requests[("PUT", "file/content")]
+
+        results[name] = dict(
+            elapsed=elapsed,
+            reloads=hub.requests[("GET", "record")],
+            control_requests=control_requests / total_files,
+            max_concurrency=hub.max_concurrency,
+        )
+
+        print(
+            f"{name} ({resources} resources, {files} files): "
+            f"{elapsed:.3f}s, {control_requests / total_files:.2f} control requests "
+            f"per file, {hub.max_concurrency} concurrent requests"
+        )
+
+    previous, current = results["per element"], results["current"]
+
+    # all requests share the same client (and its connections)
+    assert len(clients) == 1
+
+    # the elements are not reloaded after their files are uploaded
+    assert previous["reloads"] == resources + 2
+    assert current["reloads"] == 1
+    assert current["control_requests"] < previous["control_requests"]
+
+    # the uploads (of all elements) and DOIs are sent concurrently. Previously,
+    # only the files of the same element were uploaded concurrently.
+    assert previous["max_concurrency"] <= files
+    assert current["max_concurrency"] > files
+    assert current["elapsed"] < 0.7 * previous["elapsed"]
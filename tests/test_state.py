@@ -0,0 +1,86 @@
+#
+# This file is part of GEO Knowledge Hub Package Loader.
+# Copyright (C) 2021-2023 GEO Secretariat.
+#
+# GEO Knowledge Hub Package Loader is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+#
+
+"""Tests for the compact element state."""
+
+from geo_package_loader.state import ElementState
+
+
+def test_from_metadata_keeps_only_used_fields():
+    state = ElementState.from_metadata(
+        {
+            "id": "abc",
+            "status": "draft",
+            "metadata": {"title": "A large record"},
+            "links": {"self": "self-url", "files": "files-url", "html": "html-url"},
+            "pids": {"doi": {"identifier": "10.0000/abc"}},
+        },
+        "resource",
+    )
+
+    assert state.id == "abc"
+    assert state.type_ == "resource"
+    assert state.status == "draft"
+    assert state.doi == "10.0000/abc"
+    assert state.links == {"self": "self-url", "files": "files-url"}
+    assert not hasattr(state, "__dict__")
+
+
+def test_update_merges_links():
+    state = ElementState.from_metadata(
+        {"id": "abc", "links": {"self": "self-url", "files": "files-url"}}, "package"
+    )
+
+    state.update({"links": {"files": "new-files-url", "publish": "publish-url"}})
+
+    assert state.id == "abc"
+    assert state.links == {
+        "self": "self-url",
+        "files": "new-files-url",
+        "publish": "publish-url",
+    }
+
+
+def test_update_doi():
+    state = ElementState.from_metadata(
+        {"id": "abc", "status": "draft", "links": {"self": "self-url"}}, "resource"
+    )
+
+    # the DOI reservation returns only the pid
+    state.update_doi({"identifier": "10.0000/abc", "provider": "datacite"})
+
+    assert state.id == "abc"
+    assert state.status == "draft"
+    assert state.links == {"self": "self-url"}
+    assert state.doi == "10.0000/abc"
+
+    # responses without identifier keep the current DOI
+    state.update_doi({})
+    assert state.doi == "10.0000/abc"
+
+
+def test_update_with_doi_in_record():
+    state = ElementState.from_metadata(
+        {"id": "abc", "links": {"self": "self-url"}}, "resource"
+    )
+
+    state.update({"pids": {"doi": {"identifier": "10.0000/abc"}}})
+    assert state.doi == "10.0000/abc"
+
+
+def test_as_metadata():
+    state = ElementState.from_metadata(
+        {"id": "abc", "links": {"self": "self-url"}}, "resource"
+    )
+    metadata = state.as_metadata()
+
+    assert metadata == {"id": "abc", "links": {"self": "self-url"}}
+
+    # changes in the metadata don't change the state
+    metadata["links"]["self"] = "other-url"
+    assert state.links == {"self": "self-url"}